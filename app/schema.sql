@@ -443,13 +443,18 @@ WHERE net_pnl < 0 AND hold_time_minutes IS NOT NULL;
 -- INDEXES
 -------------------------------------------------
 
-CREATE INDEX IF NOT EXISTS idx_exec_date ON executions(date);
 CREATE INDEX IF NOT EXISTS idx_exec_symbol ON executions(symbol);
 CREATE INDEX IF NOT EXISTS idx_exec_underlying ON executions(underlying);
+-- FIFO matching: per-contract fills in id order (rowid is implicitly last)
+CREATE INDEX IF NOT EXISTS idx_exec_contract_txn ON executions(date, underlying, expiration, strike, option_type, transaction_type);
+-- idx_exec_contract_txn leads with date, so it also serves date lookups
+DROP INDEX IF EXISTS idx_exec_date;
 
 CREATE INDEX IF NOT EXISTS idx_rt_date ON round_trips(date);
 CREATE INDEX IF NOT EXISTS idx_rt_underlying ON round_trips(underlying);
 CREATE INDEX IF NOT EXISTS idx_rt_setup ON round_trips(setup_type);
 CREATE INDEX IF NOT EXISTS idx_rt_regime ON round_trips(market_regime);
 
-CREATE INDEX IF NOT EXISTS idx_ds_date ON daily_summary(date);
+-- daily_summary.date is the PRIMARY KEY, whose own index already serves
+-- date range scans, so drop the duplicate index older databases carry.
+DROP INDEX IF EXISTS idx_ds_date;
@@ -20,13 +20,14 @@ function initSchema(database: Database): void {
     return;
   }
 
-  // Tables exist — ensure views are up to date by extracting and running
-  // CREATE VIEW IF NOT EXISTS statements from schema.sql
-  const viewStatements = schema
+  // Tables exist — ensure views and indexes are up to date by extracting and
+  // running CREATE VIEW/INDEX IF NOT EXISTS and DROP INDEX IF EXISTS
+  // statements from schema.sql
+  const upgradeStatements = schema
     .split(';')
-    .map(s => s.trim())
-    .filter(s => /^CREATE VIEW IF NOT EXISTS/i.test(s));
-  for (const stmt of viewStatements) {
+    .map(s => s.replace(/^(\s*--.*\n)+/, '').trim())
+    .filter(s => /^(CREATE (VIEW|INDEX) IF NOT EXISTS|DROP INDEX IF EXISTS)/i.test(s));
+  for (const stmt of upgradeStatements) {
     database.exec(stmt);
   }
 }
@@ -36,7 +37,22 @@ export function getDb(): Database {
     mkdirSync(DB_DIR, { recursive: true });
     db = new Database(DB_PATH);
     db.exec('PRAGMA journal_mode=WAL');
+    // WAL makes synchronous=NORMAL durable across app crashes; only an OS
+    // crash can lose the last commits, which a re-import recovers.
+    db.exec('PRAGMA synchronous=NORMAL');
+    db.exec('PRAGMA temp_store=MEMORY');
+    db.exec('PRAGMA mmap_size=1073741824');
+    db.exec('PRAGMA cache_size=-65536');
+    db.exec('PRAGMA busy_timeout=5000');
     initSchema(db);
   }
   return db;
 }
+
+export function closeDb(): void {
+  if (db) {
+    // Closing the last connection checkpoints the WAL back into journal.db
+    db.close();
+    db = null;
+  }
+}
@@ -1,6 +1,7 @@
 import { Hono } from 'hono';
 import { serveStatic } from 'hono/bun';
 import { cors } from 'hono/cors';
+import { closeDb } from './db';
 import importRoute from './routes/import';
 import pasteImportRoute from './routes/paste-import';
 import tradesRoute from './routes/trades';
@@ -41,6 +42,14 @@ app.use('/*', serveStatic({ root: './dist/client' }));
 // SPA fallback
 app.get('/*', serveStatic({ root: './dist/client', path: 'index.html' }));
 
+// Close the shared database connection on shutdown (docker stop, Ctrl+C)
+for (const signal of ['SIGINT', 'SIGTERM'] as const) {
+  process.on(signal, () => {
+    closeDb();
+    process.exit(0);
+  });
+}
+
 export default {
   port: Number(process.env.PORT || 3000),
   fetch: app.fetch,
@@ -25,7 +25,7 @@ interface ParsedExecution {
   amount: number;
   commission: number;
   description: string;
-  rawData: string;
+  rawData: string | null;
 }
 
 export interface ImportResult {
@@ -37,23 +37,47 @@ export interface ImportResult {
 // Parsing helpers
 // ---------------------------------------------------------------------------
 
+// The original CSV row is only kept for debugging; nothing reads it back,
+// so it is opt-in to keep per-row work and DB size down.
+const STORE_RAW_DATA = process.env.JOURNAL_STORE_RAW === '1';
+
+/** True if every character of s[start, end) is an ASCII digit. */
+function isDigits(s: string, start: number, end: number): boolean {
+  for (let i = start; i < end; i++) {
+    const c = s.charCodeAt(i);
+    if (c < 48 || c > 57) return false;
+  }
+  return true;
+}
+
 /**
  * Parse OCC option symbol format.
  * Example: QQQ---260205C00609000
+ *
+ * Layout is fixed: uppercase underlying, optional '-' padding, then a
+ * 15-char tail of YYMMDD + C/P + strike * 1000 (8 digits). Parsed with
+ * slices rather than a regex since this runs for every CSV row.
  */
 export function parseOccSymbol(symbol: string): ParsedOccSymbol | null {
-  const match = symbol.match(/^([A-Z]+)-*(\d{6})([CP])(\d{8})$/);
-  if (!match) return null;
-
-  const underlying = match[1];
-  const dateStr = match[2];
-  const optionType: 'Call' | 'Put' = match[3] === 'C' ? 'Call' : 'Put';
-  const strike = parseInt(match[4], 10) / 1000;
+  const tail = symbol.length - 15;
+  if (tail < 1) return null;
+
+  const typeChar = symbol[tail + 6];
+  if (typeChar !== 'C' && typeChar !== 'P') return null;
+  if (!isDigits(symbol, tail, tail + 6) || !isDigits(symbol, tail + 7, symbol.length)) return null;
+
+  let underlyingEnd = tail;
+  while (underlyingEnd > 0 && symbol[underlyingEnd - 1] === '-') underlyingEnd--;
+  if (underlyingEnd === 0) return null;
+  for (let i = 0; i < underlyingEnd; i++) {
+    const c = symbol.charCodeAt(i);
+    if (c < 65 || c > 90) return null; // A-Z
+  }
 
-  const year = 2000 + parseInt(dateStr.slice(0, 2), 10);
-  const month = parseInt(dateStr.slice(2, 4), 10);
-  const day = parseInt(dateStr.slice(4, 6), 10);
-  const expiration = `${year}-${String(month).padStart(2, '0')}-${String(day).padStart(2, '0')}`;
+  const underlying = symbol.slice(0, underlyingEnd);
+  const optionType: 'Call' | 'Put' = typeChar === 'C' ? 'Call' : 'Put';
+  const strike = parseInt(symbol.slice(tail + 7), 10) / 1000;
+  const expiration = `20${symbol.slice(tail, tail + 2)}-${symbol.slice(tail + 2, tail + 4)}-${symbol.slice(tail + 4, tail + 6)}`;
 
   return { underlying, expiration, optionType, strike };
 }
@@ -131,70 +155,113 @@ function parseCsvLine(line: string): string[] {
   return fields;
 }
 
+/**
+ * Iterate over the lines of `content` one at a time (\n or \r\n endings)
+ * without materialising an array of every line up front.
+ */
+function* iterLines(content: string): Generator<string> {
+  let start = 0;
+  while (start < content.length) {
+    let end = content.indexOf('\n', start);
+    if (end === -1) end = content.length;
+    const lineEnd = end > start && content.charCodeAt(end - 1) === 13 ? end - 1 : end;
+    yield content.slice(start, lineEnd);
+    start = end + 1;
+  }
+}
+
+/**
+ * Value at column `idx`, or `fallback` when the header has no such column.
+ */
+function csvField(values: string[], idx: number, fallback: string): string {
+  return idx === -1 ? fallback : values[idx] ?? '';
+}
+
+/**
+ * Build a header -> value record for a CSV row (stored as raw_data).
+ */
+function csvRecord(headers: string[], values: string[]): Record<string, string> {
+  const row: Record<string, string> = {};
+  for (let j = 0; j < headers.length; j++) {
+    row[headers[j]] = values[j] ?? '';
+  }
+  return row;
+}
+
 /**
  * Parse E*Trade CSV content into an array of execution objects.
  * Finds the header row starting with 'TransactionDate', then parses each
  * subsequent row. Skips non-option rows (where parseOccSymbol returns null).
  */
 export function parseCsv(content: string): ParsedExecution[] {
-  const lines = content.split(/\r?\n/);
-
-  // Find header row
-  let headerIdx = -1;
-  for (let i = 0; i < lines.length; i++) {
-    if (lines[i].startsWith('TransactionDate')) {
-      headerIdx = i;
+  const lines = iterLines(content);
+
+  // Find header row (advance manually — breaking out of for...of would
+  // close the iterator before the data rows are read)
+  let headerLine: string | null = null;
+  for (let next = lines.next(); !next.done; next = lines.next()) {
+    if (next.value.startsWith('TransactionDate')) {
+      headerLine = next.value;
       break;
     }
   }
 
-  if (headerIdx === -1) {
+  if (headerLine === null) {
     throw new Error('Could not find CSV headers (expected row starting with TransactionDate)');
   }
 
-  const headers = parseCsvLine(lines[headerIdx]);
+  const headers = parseCsvLine(headerLine);
   const executions: ParsedExecution[] = [];
 
-  for (let i = headerIdx + 1; i < lines.length; i++) {
-    const line = lines[i].trim();
+  // Resolve column positions once; lastIndexOf matches the old record
+  // semantics where a repeated header's last column wins
+  const dateIdx = headers.lastIndexOf('TransactionDate');
+  const transactionTypeIdx = headers.lastIndexOf('TransactionType');
+  const securityTypeIdx = headers.lastIndexOf('SecurityType');
+  const symbolIdx = headers.lastIndexOf('Symbol');
+  const quantityIdx = headers.lastIndexOf('Quantity');
+  const priceIdx = headers.lastIndexOf('Price');
+  const amountIdx = headers.lastIndexOf('Amount');
+  const commissionIdx = headers.lastIndexOf('Commission');
+  const descriptionIdx = headers.lastIndexOf('Description');
+
+  // Continue from the line after the header
+  for (const rawLine of lines) {
+    const line = rawLine.trim();
     if (!line) continue;
 
     const values = parseCsvLine(line);
-    // Build a record from headers -> values
-    const row: Record<string, string> = {};
-    for (let j = 0; j < headers.length; j++) {
-      row[headers[j]] = values[j] ?? '';
-    }
 
-    if (!row['TransactionDate']) continue;
+    const rawDate = csvField(values, dateIdx, '');
+    if (!rawDate) continue;
 
     let tradeDate: string;
     try {
-      tradeDate = parseTradeDate(row['TransactionDate']);
+      tradeDate = parseTradeDate(rawDate);
     } catch {
       continue;
     }
 
-    const symbol = row['Symbol'] ?? '';
+    const symbol = csvField(values, symbolIdx, '');
     const parsed = parseOccSymbol(symbol);
     if (!parsed) continue; // Skip non-option rows
 
     try {
       executions.push({
         date: tradeDate,
-        transactionType: row['TransactionType'] ?? '',
-        securityType: row['SecurityType'] ?? '',
+        transactionType: csvField(values, transactionTypeIdx, ''),
+        securityType: csvField(values, securityTypeIdx, ''),
         symbol,
         underlying: parsed.underlying,
         expiration: parsed.expiration,
         strike: parsed.strike,
         optionType: parsed.optionType,
-        quantity: Math.abs(parseInt(row['Quantity'] ?? '0', 10)),
-        price: parseFloat(row['Price'] ?? '0'),
-        amount: parseFloat(row['Amount'] ?? '0'),
-        commission: parseFloat(row['Commission'] ?? '0'),
-        description: row['Description'] ?? '',
-        rawData: JSON.stringify(row),
+        quantity: Math.abs(parseInt(csvField(values, quantityIdx, '0'), 10)),
+        price: parseFloat(csvField(values, priceIdx, '0')),
+        amount: parseFloat(csvField(values, amountIdx, '0')),
+        commission: parseFloat(csvField(values, commissionIdx, '0')),
+        description: csvField(values, descriptionIdx, ''),
+        rawData: STORE_RAW_DATA ? JSON.stringify(csvRecord(headers, values)) : null,
       });
     } catch {
       // Skip malformed rows
@@ -209,224 +276,203 @@ export function parseCsv(content: string): ParsedExecution[] {
 // Round-trip FIFO matching
 // ---------------------------------------------------------------------------
 
-interface ExecutionRow {
-  id: number;
-  quantity: number;
-  price: number;
-  amount: number;
-  commission: number;
-  time: string | null;
+/**
+ * Key identifying one option contract on one trade date. Imports collect
+ * these for the executions they change so only those contracts are rematched.
+ */
+export function contractKey(
+  date: string, underlying: string, expiration: string, strike: number, optionType: string,
+): string {
+  return JSON.stringify([date, underlying, expiration, strike, optionType]);
 }
 
-interface ContractKey {
-  underlying: string;
-  expiration: string;
-  strike: number;
-  option_type: string;
-}
+// Expands a JSON array of contractKey() tuples into rows for a row-value IN
+const CONTRACT_KEYS_SQL = `
+  SELECT
+    json_extract(value, '$[0]'), json_extract(value, '$[1]'), json_extract(value, '$[2]'),
+    json_extract(value, '$[3]'), json_extract(value, '$[4]')
+  FROM json_each(?)
+`;
 
 /**
- * Match buys and sells into round trips using FIFO for a given trade date.
- * Mirrors the Python calculate_round_trips exactly.
+ * Match buys and sells into round trips using FIFO for the given contracts
+ * (see contractKey()). Round trips of other contracts are left untouched,
+ * so their journal fields (setup, notes, grade, ...) survive re-imports.
+ *
+ * Runs as a single INSERT ... SELECT. Buys and sells for each contract are
+ * laid out as cumulative quantity intervals in id order. Cutting the
+ * quantity axis at every point where a buy or sell ends gives segments that
+ * each lie inside exactly one buy and one sell: the lowest-id fill of each
+ * side ending at or after the segment's end. Each segment is one round trip,
+ * the same pairs the sequential FIFO walk produces. Fill details are then
+ * fetched by primary key, so there is no fill-to-fill join.
  */
-export function calculateRoundTrips(db: Database, tradeDate: string): void {
-  // Clear existing round trips for this date
-  db.query('DELETE FROM round_trips WHERE date = ?').run(tradeDate);
-
-  // Get unique contracts for this date
-  const contracts = db.query<ContractKey, [string]>(`
-    SELECT DISTINCT underlying, expiration, strike, option_type
-    FROM executions WHERE date = ?
-  `).all(tradeDate);
-
-  for (const contract of contracts) {
-    const { underlying, expiration, strike, option_type } = contract;
-
-    // Get buys ordered by id (FIFO)
-    const buys = db.query<ExecutionRow, [string, string, string, number, string]>(`
-      SELECT id, quantity, price, amount, commission, time FROM executions
-      WHERE date = ? AND underlying = ? AND expiration = ? AND strike = ? AND option_type = ?
-      AND transaction_type = 'Bought' ORDER BY id
-    `).all(tradeDate, underlying, expiration, strike, option_type);
-
-    // Get sells ordered by id
-    const sells = db.query<ExecutionRow, [string, string, string, number, string]>(`
-      SELECT id, quantity, price, amount, commission, time FROM executions
-      WHERE date = ? AND underlying = ? AND expiration = ? AND strike = ? AND option_type = ?
-      AND transaction_type = 'Sold' ORDER BY id
-    `).all(tradeDate, underlying, expiration, strike, option_type);
-
-    if (buys.length === 0 || sells.length === 0) continue;
-
-    // FIFO matching
-    let buyIdx = 0;
-    let buyRemaining = buys[0].quantity;
-    let buyPrice = buys[0].price;
-    let buyAmountPer = buys[0].amount / buys[0].quantity;
-    let buyCommPer = buys[0].commission / buys[0].quantity;
-    let buyTime = buys[0].time;
-
-    const insertRoundTrip = db.query(`
-      INSERT INTO round_trips
-      (date, underlying, expiration, strike, option_type, direction,
-       quantity, entry_price, exit_price, entry_amount, exit_amount,
-       gross_pnl, net_pnl, commission_total, pnl_percent,
-       entry_time, exit_time, hold_time_minutes)
-      VALUES (?, ?, ?, ?, ?, 'Long', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    `);
-
-    for (const sell of sells) {
-      let remaining = sell.quantity;
-      const sellPrice = sell.price;
-      const sellAmountPer = sell.amount / sell.quantity;
-      const sellCommPer = sell.commission / sell.quantity;
-      const sellTime = sell.time;
-
-      while (remaining > 0 && buyIdx < buys.length) {
-        const matchQty = Math.min(remaining, buyRemaining);
-
-        if (matchQty > 0) {
-          const grossPnl = (sellPrice - buyPrice) * matchQty * 100;
-          const netPnl = (sellAmountPer * matchQty) + (buyAmountPer * matchQty);
-          const totalComm = (buyCommPer + sellCommPer) * matchQty;
-          const pnlPct = buyPrice !== 0 ? ((sellPrice / buyPrice) - 1) * 100 : 0;
-
-          // Calculate hold time from entry/exit times
-          let holdTimeMinutes: number | null = null;
-          if (buyTime && sellTime) {
-            const [bH, bM] = buyTime.split(':').map(Number);
-            const [sH, sM] = sellTime.split(':').map(Number);
-            holdTimeMinutes = (sH * 60 + sM) - (bH * 60 + bM);
-            if (holdTimeMinutes < 0) holdTimeMinutes = null;
-          }
-
-          insertRoundTrip.run(
-            tradeDate, underlying, expiration, strike, option_type,
-            matchQty, buyPrice, sellPrice,
-            Math.abs(buyAmountPer * matchQty), sellAmountPer * matchQty,
-            grossPnl, netPnl, totalComm, pnlPct,
-            buyTime, sellTime, holdTimeMinutes,
-          );
-        }
+export function calculateRoundTrips(db: Database, contracts: Iterable<string>): void {
+  const keys = `[${[...contracts].join(',')}]`;
 
-        remaining -= matchQty;
-        buyRemaining -= matchQty;
-
-        if (buyRemaining <= 0) {
-          buyIdx++;
-          if (buyIdx < buys.length) {
-            buyRemaining = buys[buyIdx].quantity;
-            buyPrice = buys[buyIdx].price;
-            buyAmountPer = buys[buyIdx].amount / buys[buyIdx].quantity;
-            buyCommPer = buys[buyIdx].commission / buys[buyIdx].quantity;
-            buyTime = buys[buyIdx].time;
-          }
-        }
-      }
-    }
-  }
+  // Clear existing round trips for these contracts
+  db.query(`
+    DELETE FROM round_trips
+    WHERE (date, underlying, expiration, strike, option_type) IN (${CONTRACT_KEYS_SQL})
+  `).run(keys);
+
+  db.query(`
+    INSERT INTO round_trips
+    (date, underlying, expiration, strike, option_type, direction,
+     quantity, entry_price, exit_price, entry_amount, exit_amount,
+     gross_pnl, net_pnl, commission_total, pnl_percent,
+     entry_time, exit_time, hold_time_minutes)
+    WITH fills AS (
+      SELECT
+        id, date, underlying, expiration, strike, option_type, transaction_type,
+        SUM(quantity) OVER (
+          PARTITION BY date, underlying, expiration, strike, option_type, transaction_type
+          ORDER BY id
+        ) as qty_end
+      FROM executions
+      WHERE (date, underlying, expiration, strike, option_type) IN (${CONTRACT_KEYS_SQL})
+        AND transaction_type IN ('Bought', 'Sold')
+        AND quantity > 0
+    ),
+    boundaries AS (
+      SELECT
+        date, underlying, expiration, strike, option_type, qty_end as pos,
+        MIN(CASE WHEN transaction_type = 'Bought' THEN id END) as buy_here,
+        MIN(CASE WHEN transaction_type = 'Sold' THEN id END) as sell_here
+      FROM fills
+      GROUP BY date, underlying, expiration, strike, option_type, qty_end
+    ),
+    segments AS (
+      SELECT
+        pos - LAG(pos, 1, 0) OVER seg as qty,
+        MIN(buy_here) OVER rest as buy_id,
+        MIN(sell_here) OVER rest as sell_id
+      FROM boundaries
+      WINDOW
+        seg AS (PARTITION BY date, underlying, expiration, strike, option_type ORDER BY pos),
+        rest AS (seg ROWS BETWEEN CURRENT ROW AND UNBOUNDED FOLLOWING)
+    ),
+    matches AS (
+      SELECT
+        b.date, b.underlying, b.expiration, b.strike, b.option_type,
+        m.qty,
+        b.price as buy_price, s.price as sell_price,
+        b.amount / b.quantity as buy_amount_per, s.amount / s.quantity as sell_amount_per,
+        b.commission / b.quantity as buy_comm_per, s.commission / s.quantity as sell_comm_per,
+        b.time as buy_time, s.time as sell_time,
+        (CAST(strftime('%H', s.time) AS INTEGER) * 60 + CAST(strftime('%M', s.time) AS INTEGER))
+          - (CAST(strftime('%H', b.time) AS INTEGER) * 60 + CAST(strftime('%M', b.time) AS INTEGER)) as hold,
+        b.id as buy_id, s.id as sell_id
+      FROM segments m
+      JOIN executions b ON b.id = m.buy_id
+      JOIN executions s ON s.id = m.sell_id
+    )
+    SELECT
+      date, underlying, expiration, strike, option_type, 'Long',
+      qty, buy_price, sell_price,
+      ABS(buy_amount_per * qty), sell_amount_per * qty,
+      (sell_price - buy_price) * qty * 100,
+      (sell_amount_per * qty) + (buy_amount_per * qty),
+      (buy_comm_per + sell_comm_per) * qty,
+      CASE WHEN buy_price != 0 THEN ((sell_price / buy_price) - 1) * 100 ELSE 0 END,
+      buy_time, sell_time,
+      CASE WHEN hold >= 0 THEN hold END
+    FROM matches
+    ORDER BY date, sell_id, buy_id
+  `).run(keys);
 }
 
 // ---------------------------------------------------------------------------
 // Daily summary aggregation
 // ---------------------------------------------------------------------------
 
-interface SummaryRow {
-  total: number;
-  winners: number;
-  losers: number;
-  scratches: number;
-  gross_pnl: number;
-  commissions: number;
-  net_pnl: number;
-  largest_win: number;
-  largest_loss: number;
-  avg_winner: number | null;
-  avg_loser: number | null;
-  avg_trade: number | null;
-}
-
-interface SumResult {
-  value: number | null;
-}
+// Round trips within +/- this many dollars of net P&L count as scratches
+const SCRATCH_THRESHOLD = 1;
 
 /**
- * Calculate daily statistics for a given trade date.
- * Mirrors the Python calculate_daily_summary exactly.
+ * Calculate daily statistics for the given trade dates.
+ * Dates without round trips are left untouched.
  */
-export function calculateDailySummary(db: Database, tradeDate: string): void {
-  const row = db.query<SummaryRow, [string]>(`
-    SELECT
-      COUNT(*) as total,
-      SUM(CASE WHEN net_pnl > 1 THEN 1 ELSE 0 END) as winners,
-      SUM(CASE WHEN net_pnl < -1 THEN 1 ELSE 0 END) as losers,
-      SUM(CASE WHEN net_pnl >= -1 AND net_pnl <= 1 THEN 1 ELSE 0 END) as scratches,
-      SUM(gross_pnl) as gross_pnl,
-      SUM(commission_total) as commissions,
-      SUM(net_pnl) as net_pnl,
-      MAX(net_pnl) as largest_win,
-      MIN(net_pnl) as largest_loss,
-      AVG(CASE WHEN net_pnl > 0 THEN net_pnl END) as avg_winner,
-      AVG(CASE WHEN net_pnl < 0 THEN net_pnl END) as avg_loser,
-      AVG(net_pnl) as avg_trade
-    FROM round_trips WHERE date = ?
-  `).get(tradeDate);
-
-  if (!row || row.total === 0) return;
-
-  // Profit factor
-  const grossWinsRow = db.query<SumResult, [string]>(
-    'SELECT SUM(net_pnl) as value FROM round_trips WHERE date = ? AND net_pnl > 0',
-  ).get(tradeDate);
-  const grossWins = grossWinsRow?.value ?? 0;
-
-  const grossLossesRow = db.query<SumResult, [string]>(
-    'SELECT ABS(SUM(net_pnl)) as value FROM round_trips WHERE date = ? AND net_pnl < 0',
-  ).get(tradeDate);
-  const grossLosses = grossLossesRow?.value ?? 0.01;
-
-  const profitFactor = grossLosses > 0 ? grossWins / grossLosses : 0;
-  const winRate = row.total > 0 ? (row.winners / row.total) * 100 : 0;
+export function calculateDailySummary(db: Database, tradeDates: Iterable<string>): void {
+  const dates = JSON.stringify([...tradeDates]);
 
+  // Upsert in place so journal columns (plan, review, mood, ...) survive.
+  // WHERE true disambiguates INSERT ... SELECT from the ON CONFLICT clause.
   db.query(`
-    INSERT OR REPLACE INTO daily_summary
+    INSERT INTO daily_summary
     (date, total_trades, winners, losers, scratches, win_rate, gross_pnl,
      commissions, net_pnl, largest_win, largest_loss, avg_winner, avg_loser,
      avg_trade, profit_factor)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-  `).run(
-    tradeDate, row.total, row.winners, row.losers, row.scratches,
-    winRate, row.gross_pnl, row.commissions, row.net_pnl,
-    row.largest_win, row.largest_loss, row.avg_winner, row.avg_loser,
-    row.avg_trade, profitFactor,
-  );
+    SELECT
+      date, total, winners, losers, scratches,
+      winners * 1.0 / total * 100,
+      gross_pnl, commissions, net_pnl, largest_win, largest_loss,
+      avg_winner, avg_loser, avg_trade,
+      CASE WHEN gross_losses > 0 THEN gross_wins / gross_losses ELSE 0 END
+    FROM (
+      SELECT
+        date,
+        COUNT(*) as total,
+        SUM(CASE WHEN net_pnl > ?2 THEN 1 ELSE 0 END) as winners,
+        SUM(CASE WHEN net_pnl < -?2 THEN 1 ELSE 0 END) as losers,
+        SUM(CASE WHEN net_pnl >= -?2 AND net_pnl <= ?2 THEN 1 ELSE 0 END) as scratches,
+        SUM(gross_pnl) as gross_pnl,
+        SUM(commission_total) as commissions,
+        SUM(net_pnl) as net_pnl,
+        MAX(net_pnl) as largest_win,
+        MIN(net_pnl) as largest_loss,
+        AVG(CASE WHEN net_pnl > 0 THEN net_pnl END) as avg_winner,
+        AVG(CASE WHEN net_pnl < 0 THEN net_pnl END) as avg_loser,
+        AVG(net_pnl) as avg_trade,
+        COALESCE(SUM(CASE WHEN net_pnl > 0 THEN net_pnl END), 0) as gross_wins,
+        COALESCE(ABS(SUM(CASE WHEN net_pnl < 0 THEN net_pnl END)), 0.01) as gross_losses
+      FROM round_trips
+      WHERE date IN (SELECT value FROM json_each(?1))
+      GROUP BY date
+    )
+    WHERE true
+    ON CONFLICT(date) DO UPDATE SET
+      total_trades = excluded.total_trades,
+      winners = excluded.winners,
+      losers = excluded.losers,
+      scratches = excluded.scratches,
+      win_rate = excluded.win_rate,
+      gross_pnl = excluded.gross_pnl,
+      commissions = excluded.commissions,
+      net_pnl = excluded.net_pnl,
+      largest_win = excluded.largest_win,
+      largest_loss = excluded.largest_loss,
+      avg_winner = excluded.avg_winner,
+      avg_loser = excluded.avg_loser,
+      avg_trade = excluded.avg_trade,
+      profit_factor = excluded.profit_factor,
+      updated_at = CURRENT_TIMESTAMP
+  `).run(dates, SCRATCH_THRESHOLD);
 }
 
 // ---------------------------------------------------------------------------
 // Orchestrator
 // ---------------------------------------------------------------------------
 
-interface ChangesResult {
-  c: number;
-}
-
 /**
  * Import an E*Trade CSV string into the database.
  *
  * 1. Parse CSV rows
- * 2. INSERT OR IGNORE each execution (inside a transaction)
- * 3. Track affected dates
- * 4. Recalculate round trips + daily summary for each affected date
+ * 2. INSERT OR IGNORE each execution
+ * 3. Track the contracts and dates of newly inserted executions
+ * 4. Recalculate round trips for those contracts + daily summary for those dates
  * 5. Return { imported, skipped }
+ *
+ * Steps 2-4 run in a single transaction so the whole import commits once.
  */
 export function importCsv(db: Database, csvContent: string): ImportResult {
   const executions = parseCsv(csvContent);
 
   let imported = 0;
   let skipped = 0;
+  const contractsAffected = new Set<string>();
   const datesAffected = new Set<string>();
 
-  // Bulk-insert inside a transaction for performance
   const insertExecution = db.query(`
     INSERT OR IGNORE INTO executions
     (date, transaction_type, security_type, symbol, underlying, expiration,
@@ -436,7 +482,7 @@ export function importCsv(db: Database, csvContent: string): ImportResult {
 
   const insertAll = db.transaction(() => {
     for (const exec of executions) {
-      insertExecution.run(
+      const { changes } = insertExecution.run(
         exec.date,
         exec.transactionType,
         exec.securityType,
@@ -454,24 +500,23 @@ export function importCsv(db: Database, csvContent: string): ImportResult {
       );
 
       // Check if the INSERT actually inserted (vs ignored as duplicate)
-      const changes = db.query<ChangesResult, []>('SELECT changes() as c').get();
-      if (changes && changes.c > 0) {
+      if (changes > 0) {
         imported++;
+        contractsAffected.add(
+          contractKey(exec.date, exec.underlying, exec.expiration, exec.strike, exec.optionType),
+        );
+        datesAffected.add(exec.date);
       } else {
         skipped++;
       }
-
-      datesAffected.add(exec.date);
     }
+
+    // Recalculate only the contracts (and their dates) that gained executions
+    calculateRoundTrips(db, contractsAffected);
+    calculateDailySummary(db, datesAffected);
   });
 
   insertAll();
 
-  // Recalculate round trips and daily summary for each affected date
-  for (const tradeDate of datesAffected) {
-    calculateRoundTrips(db, tradeDate);
-    calculateDailySummary(db, tradeDate);
-  }
-
   return { imported, skipped };
 }
@@ -1,5 +1,5 @@
 import type { Database } from 'bun:sqlite';
-import { buildOccSymbol, calculateRoundTrips, calculateDailySummary } from './import';
+import { buildOccSymbol, contractKey, calculateRoundTrips, calculateDailySummary } from './import';
 
 // ---------------------------------------------------------------------------
 // Types
@@ -157,17 +157,15 @@ export function parsePasteContent(text: string): ParsedPasteExecution[] {
 // Import orchestrator
 // ---------------------------------------------------------------------------
 
-interface ChangesResult {
-  c: number;
-}
-
 /**
  * Import pasted E*Trade order history into the database.
  *
  * Strategy:
  * 1. For each parsed execution, try UPDATE matching execution's `time` where `time IS NULL`
  * 2. If 0 rows updated, INSERT new execution (build OCC symbol, calculate amount)
- * 3. Recalculate round_trips + daily_summary for affected dates
+ * 3. Recalculate round_trips for affected contracts + daily_summary for their dates
+ *
+ * All steps run in a single transaction so the import commits once.
  */
 export function importPaste(db: Database, text: string): PasteImportResult {
   const executions = parsePasteContent(text);
@@ -175,6 +173,7 @@ export function importPaste(db: Database, text: string): PasteImportResult {
   let updated = 0;
   let inserted = 0;
   let skipped = 0;
+  const contractsAffected = new Set<string>();
   const datesAffected = new Set<string>();
 
   const updateTime = db.query(`
@@ -194,16 +193,18 @@ export function importPaste(db: Database, text: string): PasteImportResult {
 
   const doImport = db.transaction(() => {
     for (const exec of executions) {
+      const key = contractKey(exec.date, exec.underlying, exec.expiration, exec.strike, exec.optionType);
+
       // Try to update an existing execution that has no time
-      updateTime.run(
+      const updateResult = updateTime.run(
         exec.time,
         exec.date, exec.underlying, exec.expiration, exec.strike,
         exec.optionType, exec.transactionType, exec.quantity, exec.price,
       );
 
-      const updateChanges = db.query<ChangesResult, []>('SELECT changes() as c').get();
-      if (updateChanges && updateChanges.c > 0) {
+      if (updateResult.changes > 0) {
         updated++;
+        contractsAffected.add(key);
         datesAffected.add(exec.date);
         continue;
       }
@@ -214,29 +215,27 @@ export function importPaste(db: Database, text: string): PasteImportResult {
       const sign = exec.transactionType === 'Bought' ? -1 : 1;
       const amount = (exec.price * exec.quantity * 100 * sign) - exec.commission;
 
-      insertExecution.run(
+      const insertResult = insertExecution.run(
         exec.date, exec.time, exec.transactionType, symbol,
         exec.underlying, exec.expiration, exec.strike, exec.optionType,
         exec.quantity, exec.price, amount, exec.commission,
       );
 
-      const insertChanges = db.query<ChangesResult, []>('SELECT changes() as c').get();
-      if (insertChanges && insertChanges.c > 0) {
+      if (insertResult.changes > 0) {
         inserted++;
+        contractsAffected.add(key);
         datesAffected.add(exec.date);
       } else {
         skipped++;
       }
     }
+
+    // Recalculate only the contracts (and their dates) that changed
+    calculateRoundTrips(db, contractsAffected);
+    calculateDailySummary(db, datesAffected);
   });
 
   doImport();
 
-  // Recalculate round trips and daily summary for each affected date
-  for (const tradeDate of datesAffected) {
-    calculateRoundTrips(db, tradeDate);
-    calculateDailySummary(db, tradeDate);
-  }
-
   return { updated, inserted, skipped };
 }